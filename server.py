@@ -1,18 +1,24 @@
 import os
+import functools
 import logging
 import argparse
 import mimetypes
+import mmap
 import datetime
 import lizard
+import numpy as np
 import pandas as pd
 import multiprocessing
 import re
+import threading
+import types
 
 from llama_cpp import Llama
-from pygount import SourceAnalysis, ProjectSummary
+from pygount import SourceAnalysis
 from git import Repo
 from pathlib import Path
 from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
 from fastmcp import FastMCP
 from typing import Dict
 
@@ -40,6 +46,11 @@ mcp = FastMCP("Source Tree Server")
 
 basedir = "unsloth/Llama-3.3-70B-Instruct-GGUF"
 
+# Initialize the MIME database once at import time, so file info lookups are
+# a plain dict access instead of a guess_type call
+mimetypes.init()
+_EXT_TO_MIME = mimetypes.types_map.copy()
+
 def sanitize_path(path: str) -> str:
     """
     Sanitize the given path by replacing any backslashes with forward slashes. Also checking for directory traversal.
@@ -76,9 +87,12 @@ def get_files_from_git_tree(path: str, file_extension:str = "") -> list[str]:
     Returns:
         list[str]: A list of file paths.
     """
-    repo = Repo(os.path.abspath(basedir))
-    
+    repo = _get_repo()
+
     entries:list[str]  = []
+
+    if repo is None:
+        return entries
     
     for entry in repo.commit().tree.traverse():
         epath = str(entry.path) # type: ignore
@@ -104,7 +118,25 @@ def get_file_size(path: str) -> int:
     return os.path.getsize(path)
     
 def is_git_repo() -> bool:
-    return os.path.exists(os.path.join(basedir, ".git"))
+    return _get_repo() is not None
+
+@functools.cache
+def _get_repo() -> Repo | None:
+    """Return the persistent :class:`git.Repo` handle for basedir.
+
+    The repository check and the handle construction happen once; subsequent
+    calls are served from the cache without touching the filesystem. The
+    cache is cleared in :func:`main` after basedir has been assigned from the
+    runtime arguments.
+
+    Returns
+    -------
+    Repo | None
+        The repository handle, or ``None`` if basedir is no git repository.
+    """
+    gitDir = os.path.join(basedir, '.git')
+
+    return Repo(basedir) if os.path.isdir(gitDir) else None
 
 @mcp.tool()
 def transpile_code(code:str) -> str:
@@ -190,7 +222,7 @@ def ask_companion(question:str) -> str:
     
     result = f"\n--- Expert companion expertise ---{output["choices"][0]["text"]}"
     
-    logger.info(f"My answer is ready:{result}")
+    logger.info("My answer is ready:%s", result)
     
     return result
 
@@ -223,20 +255,16 @@ def get_files(folder_path:str = "", file_extension:str = "") -> list[str]:
     
     dir = sanitize_path(os.path.join(basedir, folder_path))
     
-    logger.info(f"About to retrieve files from {dir}")
-    
-    entries = []
-    
-    if os.path.exists(dir):
-        entries = os.listdir(dir)
-        
-    files = [f for f in entries if os.path.isfile(os.path.join(dir, f))]
-    
-    if not file_extension == "":
-        logger.info(f"Filtering files with extension {file_extension}")
-        files = [f for f in files if f.endswith(file_extension)]
+    logger.info("About to retrieve files from %s", dir)
     
-    return files
+    if not os.path.exists(dir):
+        return []
+
+    with os.scandir(dir) as entries:
+        if not file_extension == "":
+            logger.info("Filtering files with extension %s", file_extension)
+            return [e.name for e in entries if e.name.endswith(file_extension) and e.is_file(follow_symlinks=False)]
+        return [e.name for e in entries if e.is_file(follow_symlinks=False)]
     
 
 @mcp.tool()    
@@ -259,14 +287,14 @@ def get_file_info(path:str) -> Dict[str, str]:
     Dict[str, str]
         A dictionary containing information about the file located at the given *path*. The keys and values are strings.
     """
-    logger.info(f"About to retrieve file info from {path}")
+    logger.info("About to retrieve file info from %s", path)
 
     fullPath = sanitize_path(os.path.join(basedir, path))
 
     if not os.path.isfile(fullPath):
         return {}
 
-    mimeType, _ = mimetypes.guess_type(fullPath)
+    mimeType = _EXT_TO_MIME.get(os.path.splitext(fullPath)[1].lower())
 
     stats = os.stat(fullPath)
     info = {
@@ -298,7 +326,7 @@ def get_file_content(path:str, start_line:int=0, end_line:int=0) -> str:
     str
         A string containing the contents of the file located at the given *path*.
     """
-    logger.info(f"About to retrieve file content from {path}")
+    logger.info("About to retrieve file content from %s", path)
 
     fullPath = sanitize_path(os.path.join(basedir, path))
 
@@ -311,9 +339,18 @@ def get_file_content(path:str, start_line:int=0, end_line:int=0) -> str:
             for i, line in enumerate(fp):
                 if i >= start_line and i <= end_line:
                     content = content + line + "\n"
+    elif os.path.getsize(fullPath) > 1 << 20:
+        # For large files, map the content and decode it in one pass, which
+        # avoids the doubled bytes -> str memory peak of read_text
+        with open(fullPath, 'rb') as fp:
+            mapped = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                content = mapped[:].decode('utf-8', errors='replace')
+            finally:
+                mapped.close()
     else:
         content = Path(fullPath).read_text()
-        
+
     return content
 
 @mcp.tool()
@@ -361,7 +398,7 @@ def grep(path:str, pattern:str, lines_before:int = 0, lines_after:int = 0) -> li
                     for j in range(i + 1, end_idx):
                         result.append((j + 1, lines[j].rstrip('\n')))
     except Exception as e:
-        logger.error(f"Error in grep for pattern '{pattern}' in path '{path}': {e}")
+        logger.error("Error in grep for pattern '%s' in path '%s': %s", pattern, path, e)
     
     return result
 
@@ -383,14 +420,70 @@ def get_directories(path:str = "") -> list[str]:
         A list of directory names located directly under *path*, which exists as a subdirectory
         of runtime argument base-dir.
     """
-    logger.info(f"About to retrieve directories from {path}")
+    logger.info("About to retrieve directories from %s", path)
 
     fullPath = sanitize_path(os.path.join(basedir, path))
     
     if not os.path.isdir(fullPath):
         return []
-    
-    return [d for d in os.listdir(fullPath) if os.path.isdir(os.path.join(fullPath, d))]
+
+    with os.scandir(fullPath) as entries:
+        return [e.name for e in entries if e.is_dir(follow_symlinks=False)]
+
+# Minimum number of top level sub directories before language counting fans
+# out to worker threads; small trees stay sequential to avoid the pool
+# startup overhead
+_PARALLEL_MIN_DIRS = 4
+
+# Maps well known source file extensions to their programming language
+_LANGUAGE_MAP = types.MappingProxyType({
+    '.py': 'Python',
+    '.js': 'JavaScript',
+    '.java': 'Java',
+    '.cpp': 'C++',
+    '.c' : 'C',
+    '.cs' : 'C#',
+    '.rb' : 'Ruby',
+    '.php' : 'PHP',
+    '.go' : 'Go',
+    '.ts' : 'TypeScript',
+    '.rs' : 'Rust',
+    '.swift' : 'Swift'
+})
+
+def _iter_files(root: str):
+    """Yield ``(path, name)`` pairs for every file below *root*.
+
+    The traversal is iterative and based on :func:`os.scandir`, so file-type
+    checks are answered from the stat information cached on each directory
+    entry instead of issuing an extra stat call per file. ``.git`` directories
+    are skipped without descending into them.
+
+    Parameters
+    ----------
+    root : str
+        The directory to traverse.
+
+    Yields
+    ------
+    tuple[str, str]
+        The full path and the plain name of each file found.
+    """
+    pending = deque([root])
+
+    while pending:
+        current = pending.popleft()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.name == ".git":
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        yield entry.path, entry.name
+        except OSError as e:
+            logger.error("Error scanning directory '%s': %s", current, e)
 
 def detect_languages(path: str, languageCounter: Counter[str]) -> Counter[str]:
     """Retrieve a list of directory names in *path*, which is, if provided, a subdirectory inside
@@ -410,57 +503,163 @@ def detect_languages(path: str, languageCounter: Counter[str]) -> Counter[str]:
     Counter[str]
         An updated counter object containing the number of files found for each language in the specified directory.
     """
-    languageMap = {
-        '.py': 'Python',
-        '.js': 'JavaScript',
-        '.java': 'Java',
-        '.cpp': 'C++',
-        '.c' : 'C',
-        '.cs' : 'C#',
-        '.rb' : 'Ruby',
-        '.php' : 'PHP',
-        '.go' : 'Go',
-        '.ts' : 'TypeScript',
-        '.rs' : 'Rust',
-        '.swift' : 'Swift'
-    }
-    
-    numFiles = 0
-    
     path = sanitize_path(os.path.join(basedir, path))
-    
-    for root, _, files in os.walk(path): # type: ignore
-        for file in files:
-            if os.path.isdir(os.path.join(path, file)):
-                detect_languages(os.path.join(path, file), languageCounter)
-            else:
-                _, ext = os.path.splitext(file)
-                if ext in languageMap:
-                    languageCounter[languageMap[ext]] += 1
-                    numFiles = numFiles + 1
-    
+
+    languageCounter.update(_count_subtree(path))
+
     return languageCounter
 
+def _count_subtree(path: str) -> Counter[str]:
+    """Count the language files below *path*.
+
+    This is a pure function of its argument, so it can run in worker
+    threads when counting sub trees in parallel.
+
+    Parameters
+    ----------
+    path : str
+        The directory whose sub tree should be counted.
+
+    Returns
+    -------
+    Counter[str]
+        The number of files found for each language below *path*.
+    """
+    counter:Counter[str] = Counter()
+
+    for _, file in _iter_files(path):
+        dot = file.rfind('.')
+        if dot < 0:
+            continue
+        language = _LANGUAGE_MAP.get(file[dot:])
+        if language is not None:
+            counter[language] += 1
+
+    return counter
+
+
+# Cached language statistics, keyed by (basedir, tree signature). The signature
+# only reacts to top level changes, so the tools that mutate the tree also
+# invalidate the cache explicitly
+_lang_cache:dict[tuple[str,int], dict[str,str]] = {}
+_lang_cache_lock = threading.Lock()
+
+def _invalidate_lang_cache() -> None:
+    """Drop all cached language statistics after the tree has been mutated."""
+    with _lang_cache_lock:
+        _lang_cache.clear()
+
+def _tree_signature(path: str) -> int:
+    """Compute a cheap change signature for the directory tree below *path*.
+
+    The signature is the most recent modification time (in nanoseconds) of
+    *path* itself and its immediate sub directories, gathered with a single
+    :func:`os.scandir` pass. This is a heuristic: a directory's mtime only
+    moves when an entry directly inside it is created, deleted or renamed,
+    so changes deeper in the tree do not bump the signature. Mutations made
+    through this server are therefore covered by
+    :func:`_invalidate_lang_cache` instead.
+
+    Parameters
+    ----------
+    path : str
+        The directory to compute the signature for.
+
+    Returns
+    -------
+    int
+        The newest modification time found, in nanoseconds.
+    """
+    signature = os.stat(path).st_mtime_ns
+
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.name == ".git":
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    signature = max(signature, entry.stat(follow_symlinks=False).st_mtime_ns)
+    except OSError as e:
+        logger.error("Error computing tree signature for '%s': %s", path, e)
+
+    return signature
 
 def get_language_stats() -> dict[str,str]:
     """Retrieve a dictionary of languages and the count of files in each language in the global runtime parameter basedir provided at start of server.
 
+    The result is cached per basedir, so repeated calls do not re-walk an
+    unchanged source tree. The cache is refreshed when the modification time
+    signature notices a top level change and is cleared explicitly by the
+    tools that mutate the tree.
+
     Returns
     -------
     dict[str,str]
         A dictionary containing the number (as string) of files found for each language.
     """
+    cacheKey = (basedir, _tree_signature(basedir))
+
+    with _lang_cache_lock:
+        cached = _lang_cache.get(cacheKey)
+
+    if cached is not None:
+        return cached
+
     languageCounter:Counter[str] = Counter()
-    
-    languageCounter = detect_languages(basedir, languageCounter)
-    
+
+    root = sanitize_path(basedir)
+
+    topDirs:list[str] = []
+
+    try:
+        with os.scandir(root) as entries:
+            for entry in entries:
+                if entry.name == ".git":
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    topDirs.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    dot = entry.name.rfind('.')
+                    if dot >= 0:
+                        language = _LANGUAGE_MAP.get(entry.name[dot:])
+                        if language is not None:
+                            languageCounter[language] += 1
+    except OSError as e:
+        logger.error("Error scanning directory '%s': %s", root, e)
+
+    # Worker threads rather than processes: the companion LLM is constructed
+    # at module import time, so a spawn-based pool (the default on Windows)
+    # would load the model once per worker just to count files
+    if len(topDirs) >= _PARALLEL_MIN_DIRS:
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            for subCounter in executor.map(_count_subtree, topDirs):
+                languageCounter.update(subCounter)
+    else:
+        for directory in topDirs:
+            languageCounter.update(_count_subtree(directory))
+
     languages:dict[str,str] = {}
-    
+
     for lang, count in languageCounter.most_common():
         languages[lang] = str(count)
-    
+
+    with _lang_cache_lock:
+        # Drop stale entries for this basedir before caching the fresh result
+        for key in [k for k in _lang_cache if k[0] == basedir]:
+            del _lang_cache[key]
+        _lang_cache[cacheKey] = languages
+
     return languages
 
+# Maps a detected language to the file extensions analyzed for it
+_EXT_BY_LANG = types.MappingProxyType({
+    'Java': ('java',),
+    'C++': ('cpp', 'hpp', 'c', 'h'),
+    'C': ('c',),
+    'PHP': ('php',),
+    'Python': ('py',)
+})
+
 def get_source_extensions() -> list[str]:
     """Retrieve a list of source file extensions found in the global runtime parameter basedir provided at start of server.
 
@@ -470,25 +669,15 @@ def get_source_extensions() -> list[str]:
         A list containing the unique source file extensions found in the specified directory.
     """
     languages = get_language_stats()
-    
+
     ext:list[str] = []
-    match(next(iter(languages.keys()))):
-        case "Java":
-            ext.append("java")
-        case "C++":
-            ext.append("cpp")
-            ext.append("hpp")
-            ext.append("c")
-            ext.append("h")
-        case "C":
-            ext.append("c")
-        case "PHP":
-            ext.append("php")
-        case "Python":
-            ext.append("py")
-        case _:
-            pass
-    return ext                        
+
+    for language in languages:
+        for extension in _EXT_BY_LANG.get(language, ()):
+            if extension not in ext:
+                ext.append(extension)
+
+    return ext
     
 @mcp.tool()
 def get_languages() -> dict[str,str]:
@@ -520,11 +709,10 @@ def get_repo_info() -> dict[str,str]:
         A dictionary containing information about the git repository located at the given *basedir*. The keys and values are strings.
     """
     repoInfo:dict[str,str] = {}
-    
-    gitDir = sanitize_path(os.path.join(basedir, '.git'))
-    
-    if os.path.exists(gitDir) and os.path.isdir(gitDir):
-        repo = Repo(basedir)
+
+    repo = _get_repo()
+
+    if repo is not None:
         current_branch = repo.head.ref.name
         repoInfo['currentBranch'] = current_branch
         commit = repo.head.commit
@@ -533,19 +721,11 @@ def get_repo_info() -> dict[str,str]:
         repoInfo['date'] = commit.committed_datetime.strftime("%Y-%m-%d %H:%M:%S")
         repoInfo['message'] = str(commit.message)
         
-        branches = ""
-        for branch in repo.branches:
-            branches = f"{branches}{branch.name}, "
-        branches = branches[:-2] # remove
-        
-        repoInfo['branches'] = branches
+        repoInfo['branches'] = ", ".join(branch.name for branch in repo.branches)
 
-        commits = ""
-        for c in repo.iter_commits(current_branch, max_count=5):
-            commits = f"{commits}{c.hexsha[:7]} - {c.author.name} - {c.summary}, "
-        commits = commits[:-2] # remove
-        
-        repoInfo['last_five_commits'] = commits
+        repoInfo['last_five_commits'] = ", ".join(
+            f"{c.hexsha[:7]} - {c.author.name} - {c.summary}" for c in repo.iter_commits(current_branch, max_count=5)
+        )
     
     return repoInfo
 
@@ -562,23 +742,24 @@ def lizard_analysis_to_dataframe(results: list[lizard.FileInformation]) -> pd.Da
     pd.DataFrame
         A DataFrame containing the analysis results, with columns for each metric provided by Lizard.
     """
-    records:list[dict[str,str]] = []
-    
-    for fileinfo in results:
-        nloc_file = fileinfo.nloc # type: ignore
-        max_ccn:int = 0
-        
-        for func_info in fileinfo.function_list: # type: ignore
-            if int(func_info.cyclomatic_complexity) > max_ccn: # type: ignore
-                max_ccn = int(func_info.cyclomatic_complexity) # type: ignore
-
-        records.append({
-            'filename': fileinfo.filename, # type: ignore
-            'max_ccn': str(max_ccn),
-            'nloc': nloc_file,
-            'func_count': str(len(fileinfo.function_list)) # type: ignore
-        })
-    return pd.DataFrame(records)
+    names = [fileinfo.filename for fileinfo in results] # type: ignore
+    max_ccns = [
+        np.fromiter(
+            (func_info.cyclomatic_complexity for func_info in fileinfo.function_list), # type: ignore
+            dtype=np.int32,
+            count=len(fileinfo.function_list) # type: ignore
+        ).max(initial=0)
+        for fileinfo in results
+    ]
+    nlocs = [fileinfo.nloc for fileinfo in results] # type: ignore
+    func_counts = [len(fileinfo.function_list) for fileinfo in results] # type: ignore
+
+    return pd.DataFrame({
+        'filename': names,
+        'max_ccn': np.asarray(max_ccns, dtype=np.int32),
+        'nloc': np.asarray(nlocs, dtype=np.int32),
+        'func_count': np.asarray(func_counts, dtype=np.int32)
+    })
 
 def get_files_for_extension(path:str, exts:list[str]) -> list[str]:
     """Retrieve a list of file names in *path*, which is, if provided, a directory inside
@@ -602,31 +783,28 @@ def get_files_for_extension(path:str, exts:list[str]) -> list[str]:
         A list of file names located directly under *path*, which exists as sub directory
         of runtime argument base-dir, that match the given extension(s). The list does not include directory paths.
     """
-    logger.info(f"About to get files for extensions in path {path}")
+    logger.info("About to get files for extensions in path %s", path)
     
     filesToAnalyze:list[str] = []
-    
-    if is_git_repo():
-        repo = Repo(".")
+
+    suffixes = tuple(f".{ext}" for ext in exts)
+
+    repo = _get_repo()
+
+    if repo is not None:
         for entry in repo.commit().tree.traverse():
             file = str(entry.abspath) # type: ignore
-            if file.endswith(tuple([f".{ext}" for ext in exts])):
+            if file.endswith(suffixes):
                 filesToAnalyze.append(file)
     else:
         sanitize_path(os.path.join(basedir, path))
-        
-        for root, _, files in os.walk(path): # type: ignore
-            for file in files:
-                entry = os.path.join(root, file).replace("\\", "/")
-                if entry.find("/.git/") > 0:
-                    continue
-                
-                logger.debug(f"About to check file: {entry}")
-                
-                if not os.path.isdir(entry):
-                    if file.endswith(tuple([f".{ext}" for ext in exts])):
-                        logger.debug(f"Adding {entry} to list of files to analyze")
-                        filesToAnalyze.append(entry)
+
+        for entry, file in _iter_files(path):
+            logger.debug("About to check file: %s", entry)
+
+            if file.endswith(suffixes):
+                logger.debug("Adding %s to list of files to analyze", entry)
+                filesToAnalyze.append(entry)
     
     return filesToAnalyze
 
@@ -648,12 +826,10 @@ def get_code_metrics() -> dict[str, str]:
     """
     df = pd.DataFrame()
     filesToAnalyze = get_files_for_extension(basedir, get_source_extensions())
-    logger.info(f"About to analyze {len(filesToAnalyze)} files")
+    logger.info("About to analyze %d files", len(filesToAnalyze))
     
-    fi:list[lizard.FileInformation] = []
-    
-    for file in filesToAnalyze:    
-        fi.append(lizard.analyze_file.analyze_source_code(file, Path(file).read_text())) # type: ignore
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        fi:list[lizard.FileInformation] = list(executor.map(lizard.analyze_file, filesToAnalyze)) # type: ignore
 
     df = lizard_analysis_to_dataframe(fi)
     return df.to_json() # type: ignore
@@ -668,14 +844,15 @@ def get_line_counts() -> dict[str, int]:
         A dictionary containing the number (as integer) of lines for each file.
     """
     filesToAnalyze = get_files_for_extension(basedir, get_source_extensions())
-    logger.info(f"About to analyze {len(filesToAnalyze)} files")
-    
-    projectSummary = ProjectSummary()
+    logger.info("About to analyze %d files", len(filesToAnalyze))
     
-    for file in filesToAnalyze:
-        projectSummary.add(SourceAnalysis.from_file(file, group="pygount")) # type: ignore
+    counts:dict[str, int] = {}
 
-    return str(projectSummary) # type: ignore
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for sourceAnalysis in executor.map(lambda file: SourceAnalysis.from_file(file, group="pygount"), filesToAnalyze):
+            counts[sourceAnalysis.path] = sourceAnalysis.code_count # type: ignore
+
+    return counts
 
 @mcp.tool()
 def get_last_n_commits(count:int = 10) -> list[str]:
@@ -693,11 +870,9 @@ def get_last_n_commits(count:int = 10) -> list[str]:
     """
     commits:list[str] = []
 
-    gitDir = os.path.join(basedir, '.git')
-    
-    if os.path.exists(gitDir) and os.path.isdir(gitDir):
-        repo = Repo(basedir)
-        
+    repo = _get_repo()
+
+    if repo is not None:
         for commit in repo.iter_commits(max_count=count):
             commits.append(str(commit))
     
@@ -719,27 +894,24 @@ def get_diff_for_commit(older_commit_hash: str = 'HEAD~1', newer_commit_hash: st
     str
         A string containing the diff between the two commits.
     """
-    gitDir = os.path.join(basedir, '.git')
-    
-    if os.path.exists(gitDir) and os.path.isdir(gitDir):
-        repo = Repo(basedir)
-        diffs = repo.commit(older_commit_hash).diff(newer_commit_hash, create_patch=True)
-        diff = ""
-        for diffitem in diffs:
-            diff = diff + str(diffitem)
+    repo = _get_repo()
+
+    if repo is not None:
+        return repo.git.diff(older_commit_hash, newer_commit_hash)
 
-        return diff
-    
     return "No git repository found in the basedir."
 
 @mcp.tool()
-def search_commits_containing_change(pattern:str) -> str:
+def search_commits_containing_change(pattern:str, max_count:int = 200) -> str:
     """Retrieve a list of commit hashes that contain changes matching the given pattern in the global runtime parameter basedir provided at start of server.
 
     Parameters
     ----------
     pattern : str
         The pattern to search for in commit messages or diffs.
+    max_count : int, optional
+        The maximum number of commits to return, so the search can stop early
+        instead of scanning the entire history. Defaults to 200.
 
     Returns
     -------
@@ -747,10 +919,9 @@ def search_commits_containing_change(pattern:str) -> str:
         A string containing the commit hashes separated by newlines.
     """
     commits:str = ""
-    gitDir = os.path.join(basedir, '.git')
-    if os.path.exists(gitDir) and os.path.isdir(gitDir):
-        repo = Repo(basedir)
-        commits = repo.git.log(G=pattern, pretty='oneline')
+    repo = _get_repo()
+    if repo is not None:
+        commits = repo.git.log('-G', pattern, f'--max-count={max_count}', '--pretty=oneline')
 
     return commits
 
@@ -771,6 +942,7 @@ def make_directory(path:str) -> str:
     path = sanitize_path(os.path.join(basedir, path))
     try:
         os.makedirs(path, exist_ok=True)
+        _invalidate_lang_cache()
         return f"Directory {path} created successfully."
     except Exception as e:
         result = repr(e)
@@ -796,10 +968,11 @@ def write_file(path:str, content:str) -> str:
     path = sanitize_path(os.path.join(basedir, path))
     parent_dir = os.path.dirname(path)
     if not os.path.exists(parent_dir):
-        logger.info(f"Creating directory {parent_dir}.")
+        logger.info("Creating directory %s.", parent_dir)
         os.makedirs(parent_dir)
     with open(path, 'w') as f:
         f.write(content)
+    _invalidate_lang_cache()
     return "File written successfully."
     try:
         with open(path, "w") as f:
@@ -827,6 +1000,7 @@ def delete_file(path:str) -> str:
     path = sanitize_path(os.path.join(basedir, path))
     try:
         os.remove(path)
+        _invalidate_lang_cache()
         return f"File {path} deleted successfully"
     except Exception as e:
         result = repr(e)
@@ -902,7 +1076,10 @@ def main():
     
     global basedir
     basedir = os.path.realpath(args.base_dir).replace("\\", "/")
-    
+
+    # The repository handle may have been cached for the import-time basedir
+    _get_repo.cache_clear()
+
     output = companion_llm(
         prompt="Tell us when you are ready to support us",
         max_tokens=1024,
@@ -911,10 +1088,10 @@ def main():
         echo=False
     )
     
-    logger.info(f"Companion LLM answered: {output['choices'][0]['text']}")
+    logger.info("Companion LLM answered: %s", output['choices'][0]['text'])
     
     if args.transport == "sse":
-        logger.info(f"Starting Source Tree MCP server")
+        logger.info("Starting Source Tree MCP server")
         mcp.settings.log_level = "INFO"
         mcp.settings.host = args.mcp_host
         mcp.settings.port = args.mcp_port